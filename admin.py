@@ -0,0 +1,47 @@
+# --- ADMIN KULLANICI TARAYICISI ---
+# Üye listesi kullanıcı adına göre keyset sayfalama ile okunur (users birincil anahtarı);
+# önek araması aynı anahtar üzerinde aralık sorgusudur. Sayfadaki üyelerin işlem sayısı,
+# son hareketi ve toplam hacmi tek toplama sorgusuyla tx_rollup'tan gelir.
+# Toplu şifre sıfırlama ve silme yazıcı kuyruğunda tek niyet olarak, executemany ile yapılır.
+import db
+import writer
+
+PAGE_SIZE = 50
+ADMIN = "admin"
+
+def _prefix_range(prefix):
+    # 'ab' -> ['ab', 'ab\U0010ffff'): BINARY karşılaştırmada öneki taşıyan tüm adlar
+    return prefix, prefix + "\U0010ffff"
+
+def count_users(prefix=""):
+    if not prefix: return db.execute("SELECT COUNT(*) FROM users", fetch=True)[0][0]
+    return db.execute("SELECT COUNT(*) FROM users WHERE username >= ? AND username < ?", _prefix_range(prefix), fetch=True)[0][0]
+
+def fetch_page(prefix="", after=None, page_size=PAGE_SIZE):
+    # Dönüş: (username, join_date, n, last_activity, volume çerçevesi, sonraki sayfanın anahtarı ya da None)
+    where, params = ["username != ?"], [ADMIN]
+    if prefix: where.append("username >= ? AND username < ?"); params.extend(_prefix_range(prefix))
+    if after: where.append("username > ?"); params.append(after)
+    df = db.read_df(f"""
+        SELECT u.username, u.join_date, COALESCE(SUM(r.n), 0) AS n, MAX(r.day) AS last_activity, COALESCE(SUM(r.total), 0) AS volume
+        FROM (SELECT username, join_date FROM users WHERE {' AND '.join(where)} ORDER BY username LIMIT ?) u
+        LEFT JOIN tx_rollup r ON r.username = u.username
+        GROUP BY u.username ORDER BY u.username""", (*params, page_size + 1))
+    nxt = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        nxt = df["username"].iloc[-1]
+    return df.reset_index(drop=True), nxt
+
+def reset_passwords(usernames, hashed):
+    return writer.executemany("UPDATE users SET password = ? WHERE username = ?", [(hashed, u) for u in usernames])
+
+def delete_users(usernames):
+    rows = [(u,) for u in usernames]
+    def _delete(conn):
+        # Özet önce silinir ki transaction trigger'ları boş tabloya dokunsun
+        # data_version en son: transactions/cat_limits silmelerinin trigger'ları onu yeniden yazar
+        for table in ("tx_rollup", "budget_status", "users", "transactions", "cat_limits", "data_version"):
+            conn.executemany(f"DELETE FROM {table} WHERE username = ?", rows)
+    writer.write(_delete)
+    return len(rows)
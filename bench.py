@@ -0,0 +1,275 @@
+# --- PERFORMANS ÖLÇÜMÜ (BENCHMARK) ---
+# users / transactions / cat_limits şemasında sentetik veri üretir ve uygulamanın sıcak
+# yollarını arayüz olmadan ölçer. mobil_finans Streamlit'in "bare mode"unda import edilir
+# (st çağrıları etkisizdir, giriş ekranında kalır); ölçülen fonksiyonlar sayfaların
+# çağırdıklarının aynısıdır. Ölçümler en çok işlemi olan ("sıcak") kullanıcı üzerinde
+# yapılır. Sonuç JSON'dur; iki çıktı --compare ile karşılaştırılır.
+#
+#   python bench.py --scale 1k --scale 100k -o bench.json
+#   python bench.py --scale 10m --users 20000 --years 5 --skew 1.2 -o bench_10m.json
+#   python bench.py --compare eski.json yeni.json
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import sqlite3
+import argparse
+import platform
+import tempfile
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import db
+import writer
+from frames import GIDER_KATEGORILERI, GELIR_KATEGORILERI
+from queries import ABONELIK_KATEGORISI
+
+SCALES = {"1k": 1_000, "100k": 100_000, "10m": 10_000_000}
+DEFAULT_USERS = {"1k": 10, "100k": 500, "10m": 20_000}
+GEN_CHUNK = 500_000
+GELIR_ORANI = 0.12
+WRITE_THREADS, WRITES_PER_THREAD = 16, 50
+SERVISLER = ["Netflix", "Spotify", "YouTube Premium", "iCloud", "Disney+", "Amazon Prime", "Exxen", "Superonline"]
+ACIKLAMALAR = {
+    "Gıda - Market": ["Migros", "BİM", "A101", "Şok", "CarrefourSA", "Manav"],
+    "Gıda - Restoran": ["Yemeksepeti", "Getir Yemek", "Kahve", "Öğle yemeği", "Akşam yemeği"],
+    "Konut - Kira": ["Kira"],
+    "Fatura": ["Elektrik", "Su", "Doğalgaz", "Telefon"],
+    "Ulaşım": ["İstanbulkart", "Akaryakıt", "Taksi", "Otopark"],
+    "Maaş": ["Maaş"],
+    "Ek Gelir": ["Freelance", "Satış"],
+    "Yatırım": ["Temettü", "Faiz"],
+}
+
+# init_db ile aynı temel tablolar; indeksler ve özet tablosu init_db ölçülürken kurulur
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password TEXT, join_date TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, date TEXT, type TEXT, category TEXT, amount REAL, description TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS cat_limits (username TEXT, category TEXT, limit_amount REAL, PRIMARY KEY (username, category))''',
+]
+
+# --- SENTETİK VERİ ---
+def _zipf(n, skew):
+    # skew=0 düzgün dağılım; büyüdükçe ilk elemanlar baskınlaşır
+    w = 1.0 / np.arange(1, n + 1) ** skew
+    return w / w.sum()
+
+def _descriptions(rng, cats):
+    out = np.full(len(cats), "", dtype=object)
+    sub = cats == ABONELIK_KATEGORISI
+    out[sub] = rng.choice(SERVISLER, sub.sum())
+    for cat, words in ACIKLAMALAR.items():
+        m = cats == cat
+        if m.any(): out[m] = rng.choice(words, m.sum())
+    # Açıklamaların bir kısmı boş bırakılır (formdan boş girilenler gibi)
+    out[rng.random(len(cats)) < 0.1] = ""
+    return out
+
+def generate(path, n_tx, n_users, years=3, skew=1.1, seed=42, now=None):
+    now = pd.Timestamp(now or datetime.now()).normalize()
+    rng = np.random.default_rng(seed)
+    users = np.array([f"user{i:06d}" for i in range(n_users)], dtype=object)
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    for q in SCHEMA: conn.execute(q)
+    conn.execute("BEGIN")
+    pw = "b" * 64  # şifre ölçülmüyor, yalnızca satır genişliği gerçekçi olsun
+    joins = (now - pd.to_timedelta(rng.integers(0, years * 365, n_users), unit="D")).strftime("%Y-%m-%d")
+    conn.executemany("INSERT INTO users VALUES (?,?,?)", zip(users, [pw] * n_users, joins))
+    limits = []
+    for u in users:
+        for c in rng.choice(GIDER_KATEGORILERI, rng.integers(3, 7), replace=False, p=_zipf(len(GIDER_KATEGORILERI), skew)):
+            limits.append((u, c, float(rng.integers(5, 60) * 100)))
+    conn.executemany("INSERT INTO cat_limits VALUES (?,?,?)", limits)
+    # Kullanıcı etkinliği ve kategoriler Zipf benzeri çarpık: birkaç kullanıcı/kategori işlemlerin çoğunu taşır
+    p_user, p_gider, p_gelir = _zipf(n_users, skew), _zipf(len(GIDER_KATEGORILERI), skew), _zipf(len(GELIR_KATEGORILERI), skew)
+    days = years * 365
+    for start in range(0, n_tx, GEN_CHUNK):
+        n = min(GEN_CHUNK, n_tx - start)
+        u = users[rng.choice(n_users, n, p=p_user)]
+        d = (now - pd.to_timedelta(rng.integers(0, days, n), unit="D")).strftime("%Y-%m-%d").to_numpy()
+        gelir = rng.random(n) < GELIR_ORANI
+        t = np.where(gelir, "Gelir", "Gider")
+        c = np.where(gelir, rng.choice(GELIR_KATEGORILERI, n, p=p_gelir), rng.choice(GIDER_KATEGORILERI, n, p=p_gider))
+        a = np.round(np.where(gelir, rng.lognormal(8.5, 0.6, n), rng.lognormal(5.5, 1.0, n)), 2)
+        conn.executemany("INSERT INTO transactions(username, date, type, category, amount, description) VALUES (?,?,?,?,?,?)",
+                         zip(u, d, t, c, a.tolist(), _descriptions(rng, c)))
+    conn.execute("COMMIT")
+    hot = conn.execute("SELECT username, COUNT(*) FROM transactions GROUP BY username ORDER BY 2 DESC LIMIT 1").fetchone()
+    conn.close()
+    return {"users": n_users, "transactions": n_tx, "years": years, "skew": skew, "seed": seed,
+            "hot_user": hot[0] if hot else None, "hot_user_rows": hot[1] if hot else 0}
+
+# --- ÖLÇÜM ---
+def timed(fn, repeat):
+    ts = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        ts.append(time.perf_counter() - t)
+    ts = np.array(ts) * 1000
+    return {"median_ms": round(float(np.median(ts)), 3), "min_ms": round(float(ts.min()), 3),
+            "p95_ms": round(float(np.percentile(ts, 95)), 3), "n": repeat}
+
+def _import_app(workdir):
+    # Uygulama modülü bir kez, boş bir veritabanına karşı import edilir
+    db.DB_FILE = os.path.join(workdir, "_bos.db")
+    os.environ["OMNYX_BUDGET_SCHEDULER"] = "0"  # ölçümlere arka plan yazması karışmasın
+    logging.disable(logging.WARNING)  # bare mode uyarıları
+    try: import mobil_finans
+    finally: logging.disable(logging.NOTSET)
+    return mobil_finans
+
+def run_scale(app, path, meta, repeat=5, now=None):
+    import queries, rollups, kpi, subscriptions, ledger, charts, admin, budgets
+    from cache import user_frames
+    now = now or datetime.now()
+    db.DB_FILE = path
+    user_frames.clear()
+    charts._figures.clear()
+    out = {}
+    t = time.perf_counter()
+    app.init_db()
+    out["init_db_cold"] = round((time.perf_counter() - t) * 1000, 3)
+    out["init_db_warm"] = timed(app.init_db, repeat)
+
+    user = meta["hot_user"]
+    def get_cold(): user_frames.invalidate(user); app.get_user_data(user)
+    out["get_user_data_cold"] = timed(get_cold, repeat)
+    out["get_user_data_warm"] = timed(lambda: app.get_user_data(user), repeat)
+    out["dashboard_kpi"] = timed(lambda: kpi.dashboard(user, now), repeat)
+
+    def limitler():
+        # Her seferinde unutulur: sayfanın kullanıcıyı yeniden değerlendirdiği yol
+        budgets._evaluated.clear()
+        _, total = budgets.current(user, now)
+        return app.generate_ai_advice(total if queries.has_transactions(user) else None)
+    out["limitler_ai"] = timed(limitler, repeat)
+    out["budgets_evaluate_all"] = timed(lambda: budgets.evaluate(now), repeat)
+
+    def abonelik():
+        s = subscriptions.schedule(queries.subscription_rows(user), now)
+        subscriptions.upcoming(s, 3, now)
+    out["subscriptions"] = timed(abonelik, repeat)
+
+    prd = (rollups.periods(user) or [now.strftime("%Y-%m")])[0]
+    p_s, p_e = queries.month_bounds(datetime.strptime(prd, "%Y-%m"))
+    def raporlar():
+        rollups.period_totals(user, prd)
+        rollups.top_category(user, prd)
+        charts.trend_data(user, p_s, p_e)
+        charts.sunburst_data(user, p_s, p_e)
+        app.get_period_rows(user, p_s, p_e)
+    out["raporlar"] = timed(raporlar, repeat)
+    def figures():
+        charts.line(charts.trend_data(user, p_s, p_e)).to_json()
+        fig = charts.sunburst(charts.sunburst_data(user, p_s, p_e))
+        if fig is not None: fig.to_json()
+    out["raporlar_figures"] = timed(figures, repeat)
+
+    out["ledger_first_page"] = timed(lambda: ledger.fetch_page(user), repeat)
+    cursor = None
+    for _ in range(20):
+        page, nxt = ledger.fetch_page(user, after=cursor)
+        if not nxt: break
+        cursor = nxt
+    out["ledger_page_21"] = timed(lambda: ledger.fetch_page(user, after=cursor), repeat)
+    page, _ = ledger.fetch_page(user)
+    ids = page["id"].tolist()
+    # Sayfadaki her satırın tutarı aynı değerle yazılır: trigger'lar ve özet güncellemesi çalışır, veri değişmez
+    edits = {"edited_rows": {i: {"amount": float(a)} for i, a in enumerate(page["amount"])}, "deleted_rows": [], "added_rows": []}
+    out["ledger_edit_page"] = timed(lambda: ledger.apply_changes(user, ids, edits), repeat)
+
+    def admin_sayfasi(): admin.count_users(); admin.fetch_page()
+    out["admin_user_page"] = timed(admin_sayfasi, repeat)
+    out["admin_user_search"] = timed(lambda: admin.fetch_page("user0001"), repeat)
+    # Silinecekler: en az işlemi olan kullanıcılar (sıcak kullanıcı korunur)
+    victims = iter(u for u, in db.execute(
+        "SELECT username FROM users WHERE username != ? ORDER BY rowid DESC LIMIT ?", (user, repeat), fetch=True))
+    out["admin_delete_user"] = timed(lambda: app.admin_delete_user(next(victims, "")), repeat)
+
+    # Eşzamanlı oturumlar: WRITE_THREADS thread'in her biri form kaydı gibi tek satır yazar
+    q = "INSERT INTO transactions(username, date, type, category, amount, description) VALUES (?,?,?,?,?,?)"
+    def yazici(i):
+        for _ in range(WRITES_PER_THREAD): app.run_query(q, (f"bench_w{i}", now.strftime("%Y-%m-%d"), "Gider", "Diğer", 1.0, ""))
+    def eszamanli():
+        ts = [threading.Thread(target=yazici, args=(i,)) for i in range(WRITE_THREADS)]
+        for x in ts: x.start()
+        for x in ts: x.join()
+    w0 = writer.get_writer(path)
+    b0, i0 = w0.batches, w0.intents
+    out["concurrent_writes"] = timed(eszamanli, repeat)
+    out["concurrent_writes"]["writes"] = WRITE_THREADS * WRITES_PER_THREAD
+    out["concurrent_writes"]["avg_batch"] = round((w0.intents - i0) / max(w0.batches - b0, 1), 1)
+    writer.close_all()
+    db.get_pool(path).close_all()
+    return out
+
+def environment():
+    return {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "pandas": pd.__version__,
+            "numpy": np.__version__, "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds")}
+
+def compare(old_path, new_path, tolerance):
+    with open(old_path, encoding="utf-8") as f: old = json.load(f)
+    with open(new_path, encoding="utf-8") as f: new = json.load(f)
+    worse = 0
+    for scale, res in new["scales"].items():
+        base = old["scales"].get(scale)
+        if not base: continue
+        print(f"[{scale}]")
+        for name, v in res["timings"].items():
+            b = base["timings"].get(name)
+            if not isinstance(v, dict) or not isinstance(b, dict) or not b["median_ms"]: continue
+            r = v["median_ms"] / b["median_ms"]
+            flag = "  YAVAŞLADI" if r > 1 + tolerance else ""
+            worse += bool(flag)
+            print(f"  {name:<26}{b['median_ms']:>12.2f}{v['median_ms']:>12.2f} ms  x{r:.2f}{flag}")
+    return 1 if worse else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="OmnyxWallet sıcak yollarını sentetik veriyle ölçer")
+    ap.add_argument("--scale", action="append", choices=list(SCALES), help="birden çok verilebilir (varsayılan: 1k)")
+    ap.add_argument("--users", type=int, help="kullanıcı sayısı (varsayılan ölçeğe göre)")
+    ap.add_argument("--years", type=int, default=3, help="geçmiş uzunluğu")
+    ap.add_argument("--skew", type=float, default=1.1, help="kullanıcı/kategori çarpıklığı (0 = düzgün)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--workdir", help="veritabanlarının üretileceği dizin (varsayılan: geçici, sonra silinir)")
+    ap.add_argument("-o", "--output", help="JSON çıktı (varsayılan: stdout)")
+    ap.add_argument("--compare", nargs=2, metavar=("ESKI", "YENI"))
+    ap.add_argument("--tolerance", type=float, default=0.2, help="--compare: kabul edilen yavaşlama oranı")
+    args = ap.parse_args(argv)
+    if args.compare: return compare(*args.compare, args.tolerance)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="omnyx_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    result = {"env": environment(), "scales": {}}
+    try:
+        app = _import_app(workdir)
+        for scale in args.scale or ["1k"]:
+            path = os.path.join(workdir, f"bench_{scale}.db")
+            if os.path.exists(path): os.remove(path)
+            t = time.perf_counter()
+            meta = generate(path, SCALES[scale], args.users or DEFAULT_USERS[scale], args.years, args.skew, args.seed)
+            meta["generate_s"] = round(time.perf_counter() - t, 2)
+            print(f"{scale}: {meta['transactions']:,} işlem, {meta['users']:,} kullanıcı üretildi ({meta['generate_s']} sn)", file=sys.stderr)
+            timings = run_scale(app, path, meta, args.repeat)
+            meta["db_bytes"] = os.path.getsize(path)
+            result["scales"][scale] = {**meta, "timings": timings}
+    finally:
+        if not args.workdir: shutil.rmtree(workdir, ignore_errors=True)
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+    else: print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
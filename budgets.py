@@ -0,0 +1,139 @@
+# --- BÜTÇE DEĞERLENDİRME ---
+# Tüm kullanıcıların limitleri bu ayki harcamayla tek SQL geçişinde karşılaştırılır:
+# cat_limits, tx_rollup'ın (username, period) anahtarına join edilir. Sonuç kategori
+# başına ve kullanıcı toplamı (category = TOPLAM) olarak budget_status tablosuna yazılır;
+# Limitler & AI sayfası ve admin paneli bu tabloyu okur. Toplu değerlendirme CLI'dan
+# (watch), admin panelinden ya da OMNYX_BUDGET_SCHEDULER=1 ile süreç içindeki zamanlayıcıdan
+# çalışır; sayfa yalnızca o kullanıcının verisi değiştiyse kendi satırlarını yeniler.
+#
+#   python budgets.py evaluate                -> bu ayı tüm kullanıcılar için değerlendirir
+#   python budgets.py report --status critical -> aşımdaki kullanıcıları listeler
+#   python budgets.py watch --interval 300     -> zamanlayıcı olarak sürekli çalışır
+import os
+import sys
+import time
+import argparse
+import threading
+from datetime import datetime
+
+import db
+import writer
+import migrations
+from cache import data_version
+
+TOPLAM = "*"
+GOOD, WARNING, CRITICAL = "good", "warning", "critical"
+WARNING_PCT, CRITICAL_PCT = 80, 100
+INTERVAL_S = 300
+SCHEDULER = os.environ.get("OMNYX_BUDGET_SCHEDULER", "0") == "1"
+
+def _evaluate_sql(n_users):
+    # ?1 = dönem, ?2 = zaman damgası, ?3... = kullanıcı filtresi
+    only = f"WHERE username IN ({', '.join(f'?{i + 3}' for i in range(n_users))})" if n_users else ""
+    return f'''
+        INSERT INTO budget_status
+        WITH lim AS (SELECT username, category, limit_amount FROM cat_limits {only}),
+        rows AS (
+            SELECT l.username, l.category, l.limit_amount,
+                   (SELECT COALESCE(SUM(r.total), 0) FROM tx_rollup r WHERE r.username = l.username AND r.period = ?1
+                        AND r.type = 'Gider' AND r.category = l.category) AS spent
+            FROM lim l
+            UNION ALL
+            SELECT u.username, '{TOPLAM}', u.limit_amount,
+                   (SELECT COALESCE(SUM(r.total), 0) FROM tx_rollup r WHERE r.username = u.username AND r.period = ?1 AND r.type = 'Gider')
+            FROM (SELECT username, SUM(limit_amount) AS limit_amount FROM lim GROUP BY username) u),
+        scored AS (SELECT *, CASE WHEN limit_amount > 0 THEN spent * 100.0 / limit_amount ELSE 0 END AS pct FROM rows)
+        SELECT username, ?1, category, limit_amount, spent, pct,
+               CASE WHEN pct > {CRITICAL_PCT} THEN '{CRITICAL}' WHEN pct > {WARNING_PCT} THEN '{WARNING}' ELSE '{GOOD}' END, ?2
+        FROM scored'''
+
+def evaluate(now=None, usernames=None, path=None):
+    # usernames verilmezse tüm kullanıcılar; dönen: yazılan satır sayısı
+    period = (now or datetime.now()).strftime("%Y-%m")
+    stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    users = list(usernames or [])
+    def _run(conn):
+        # Limiti silinen kategoriler kalmasın diye dönem satırları baştan yazılır
+        if users: conn.execute(f"DELETE FROM budget_status WHERE period = ? AND username IN ({','.join('?' * len(users))})", (period, *users))
+        else: conn.execute("DELETE FROM budget_status WHERE period = ?", (period,))
+        return conn.execute(_evaluate_sql(len(users)), (period, stamp, *users)).rowcount
+    return writer.write(_run, path=path)
+
+def user_status(username, now=None):
+    # Dönüş: (kategori satırları, toplam satırı ya da None)
+    period = (now or datetime.now()).strftime("%Y-%m")
+    rows = db.execute('''SELECT category, limit_amount, spent, pct, status FROM budget_status
+        WHERE username = ? AND period = ? ORDER BY category''', (username, period), fetch=True)
+    rows = [dict(zip(("category", "limit_amount", "spent", "pct", "status"), r)) for r in rows]
+    total = next((r for r in rows if r["category"] == TOPLAM), None)
+    return [r for r in rows if r["category"] != TOPLAM], total
+
+_evaluated = {}  # (username, dönem) -> değerlendirildiği data_version
+_evaluated_lock = threading.Lock()
+
+def current(username, now=None):
+    # Sayfa için: kullanıcının işlemleri ya da limitleri son değerlendirmeden beri değiştiyse
+    # yalnızca onu yeniden değerlendir. Sürüm veritabanındaki trigger'lardan gelir (bkz. cache.py);
+    # içe aktarma CLI'ı, başka bir worker ya da özet yeniden üretimi de onu artırır.
+    key = (username, (now or datetime.now()).strftime("%Y-%m"))
+    version = data_version(username)
+    with _evaluated_lock: fresh = _evaluated.get(key) == version
+    if not fresh:
+        evaluate(now, [username])
+        with _evaluated_lock: _evaluated[key] = version
+    return user_status(username, now)
+
+def flagged(now=None, statuses=(CRITICAL, WARNING), limit=100):
+    period = (now or datetime.now()).strftime("%Y-%m")
+    return db.read_df(f'''SELECT username, limit_amount, spent, pct, status, evaluated_at FROM budget_status
+        WHERE period = ? AND category = '{TOPLAM}' AND status IN ({','.join('?' * len(statuses))})
+        ORDER BY pct DESC LIMIT ?''', (period, *statuses, limit))
+
+# --- ZAMANLAYICI ---
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def start_scheduler(interval=INTERVAL_S, path=None):
+    # Süreç başına bir kez: tüm kullanıcıları her `interval` saniyede bir değerlendirir
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None and _scheduler.is_alive(): return _scheduler
+        def loop():
+            while True:
+                try: evaluate(path=path)
+                except Exception as e: print(f"Bütçe değerlendirmesi başarısız: {e!r}", file=sys.stderr)
+                time.sleep(interval)
+        _scheduler = threading.Thread(target=loop, name="omnyx-budgets", daemon=True)
+        _scheduler.start()
+        return _scheduler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bütçe limitlerini tüm kullanıcılar için değerlendirir")
+    ap.add_argument("command", choices=["evaluate", "report", "watch"])
+    ap.add_argument("--db", default=db.DB_FILE)
+    ap.add_argument("--period", help="YYYY-MM (varsayılan: bu ay)")
+    ap.add_argument("--user", action="append", help="yalnızca bu kullanıcılar (birden çok verilebilir)")
+    ap.add_argument("--status", action="append", choices=[CRITICAL, WARNING, GOOD], help="report: gösterilecek durumlar")
+    ap.add_argument("--interval", type=int, default=INTERVAL_S, help="watch: saniye")
+    args = ap.parse_args(argv)
+    db.DB_FILE = args.db
+    migrations.ensure(args.db)
+    now = datetime.strptime(args.period, "%Y-%m") if args.period else None
+    if args.command == "watch":
+        while True:
+            t = time.perf_counter()
+            n = evaluate(now, args.user)
+            print(f"{datetime.now():%H:%M:%S} {n:,} satır ({time.perf_counter() - t:.2f} sn)", flush=True)
+            time.sleep(args.interval)
+    if args.command == "evaluate":
+        t = time.perf_counter()
+        n = evaluate(now, args.user)
+        print(f"{n:,} bütçe satırı yazıldı ({time.perf_counter() - t:.2f} sn).")
+        return 0
+    df = flagged(now, tuple(args.status or [CRITICAL, WARNING]), limit=-1)
+    if df.empty: print("Uyarı yok."); return 0
+    print(df.to_string(index=False))
+    return 1 if (df["status"] == CRITICAL).any() else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# --- KULLANICI VERİ ÖNBELLEĞİ ---
+# Her widget etkileşimi bir rerun demektir; kullanıcının işlem tablosu değişmediyse
+# tekrar okunup tarihleri yeniden parse edilmesin diye çerçeveler süreç içinde tutulur.
+# Geçerlilik veritabanındaki data_version sayacına bağlıdır: transactions ve cat_limits
+# üzerindeki trigger'lar her yazmada kullanıcının sürümünü artırır (bkz. migrations.py),
+# yazma formdan, içe aktarma CLI'ından ya da başka bir worker'dan gelmiş olsun. Önbellekteki
+# çerçevenin sürümü eskiyse bir sonraki okumada yeniden yüklenir.
+# Dönen çerçeveler paylaşılır, çağıranlar yerinde değiştirmemelidir.
+import threading
+import time
+from collections import OrderedDict
+
+import db
+
+MAX_ENTRIES = 64
+TTL_SECONDS = 600
+MAX_BYTES = 256 * 1024 * 1024
+
+def data_version(username):
+    row = db.execute("SELECT version FROM data_version WHERE username = ?", (username,), fetch=True)
+    return row[0][0] if row else 0
+
+
+class FrameCache:
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # username -> (veri sürümü, yüklenme zamanı, df, bayt)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def invalidate(self, username):
+        with self._lock: self._drop(username)
+
+    def get(self, username, loader):
+        # Sürüm yüklemeden önce okunur; yükleme sırasında gelen bir yazma sürümü
+        # artırdığı için bir sonraki okuma çerçeveyi yeniler
+        version = data_version(username)
+        with self._lock:
+            e = self._entries.get(username)
+            if e and e[0] == version and time.monotonic() - e[1] < self.ttl:
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return e[2]
+            self.misses += 1
+        df = loader(username)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            self._drop(username)
+            self._entries[username] = (version, time.monotonic(), df, nbytes)
+            self._bytes += nbytes
+            self._evict()
+        return df
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def report(self):
+        # Oturumların paylaştığı çerçevelerin bellek dökümü (admin paneli)
+        now = time.monotonic()
+        with self._lock:
+            return [{"username": u, "rows": len(e[2]), "bytes": e[3], "version": e[0], "age_s": round(now - e[1])}
+                    for u, e in reversed(self._entries.items())]
+
+    def _drop(self, username):
+        e = self._entries.pop(username, None)
+        if e: self._bytes -= e[3]
+
+    def _evict(self):
+        # En son kullanılan giriş her zaman kalır, tek başına sınırı aşsa bile
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, e = self._entries.popitem(last=False)
+            self._bytes -= e[3]
+
+
+user_frames = FrameCache()
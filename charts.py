@@ -0,0 +1,112 @@
+# --- GRAFİK VERİ KATMANI ---
+# Plotly figürleri ham satırlardan değil önceden toplanmış veriden kurulur:
+#  - sunburst: her kategoride en büyük TOP_N açıklama, kalanı "Diğer" yaprağında toplanır
+#  - trendler: aralık uzadıkça gün -> hafta -> ay kovalarına geçilir
+# Kurulan figür JSON olarak (kullanıcı, grafik, dönem) anahtarıyla, girdi verisinin özetiyle
+# birlikte saklanır. Veri her rerun'da veritabanından (çoğu tx_rollup'tan) okunur; yalnızca
+# figür kurulumu ve serileştirmesi atlanır. Başka süreçten gelen yazmalar da özeti değiştirir,
+# grafikler yanlarındaki KPI'larla aynı rakamı gösterir. plotly ancak bir figür gerçekten
+# kurulacağı zaman import edilir; giriş ekranı ve admin paneli onu hiç yüklemez.
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import db
+import perf
+
+TOP_N = 6
+DIGER = "Diğer"
+ACIKLAMASIZ = "Açıklamasız"
+MAX_FIGURES = 256
+RENKLER = {"Gelir": "#00FFA3", "Gider": "#FF4B4B"}
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+def digest(df):
+    return len(df), int(pd.util.hash_pandas_object(df, index=False).sum()) if len(df) else 0
+
+def cached(key, df, build):
+    # key: (kullanıcı, grafik, ...); build(df) -> plotly Figure ya da None (veri yok)
+    # Dönüş: st.plotly_chart'a verilebilecek dict ya da None
+    d = digest(df)
+    with _lock:
+        e = _figures.get(key)
+        if e and e[0] == d:
+            _figures.move_to_end(key)
+            return json.loads(e[1]) if e[1] else None
+    t0 = perf.now() if perf.ENABLED else None
+    fig = build(df)
+    if t0 is not None: perf.record(perf.FIGURE, f"{key[1]} kurulum", t0); t0 = perf.now()
+    s = fig.to_json() if fig is not None else ""
+    if t0 is not None: perf.record(perf.FIGURE, f"{key[1]} json", t0)
+    with _lock:
+        _figures[key] = (d, s)
+        _figures.move_to_end(key)
+        while len(_figures) > MAX_FIGURES: _figures.popitem(last=False)
+    return json.loads(s) if s else None
+
+def bucket_for(start, end):
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days
+    return "D" if days <= 62 else "W" if days <= 366 else "M"
+
+def trend_data(username, start, end):
+    # tx_rollup'tan günlük toplamlar, aralığa göre hafta/ay kovalarına indirgenir
+    df = db.read_df("""
+        SELECT day AS date, type, SUM(total) AS amount FROM tx_rollup
+        WHERE username = ? AND day >= ? AND day < ? GROUP BY day, type""", (username, start, end))
+    if df.empty: return df
+    df["date"] = pd.to_datetime(df["date"])
+    freq = bucket_for(start, end)
+    if freq != "D":
+        df["date"] = df["date"].dt.to_period(freq).dt.start_time
+        df = df.groupby(["date", "type"], as_index=False)["amount"].sum()
+    return df.sort_values("date").reset_index(drop=True)
+
+def sunburst_data(username, start, end, top_n=TOP_N):
+    df = db.read_df("""
+        SELECT category, COALESCE(NULLIF(TRIM(description), ''), ?) AS description, SUM(amount) AS amount
+        FROM transactions WHERE username = ? AND date >= ? AND date < ? AND type = 'Gider'
+        GROUP BY category, 2""", (ACIKLAMASIZ, username, start, end))
+    return fold_top_n(df, top_n)
+
+def fold_top_n(df, top_n=TOP_N):
+    # df: category, description, amount -> kategori başına en büyük top_n + "Diğer"
+    if df.empty: return df
+    df = df.sort_values(["category", "amount"], ascending=[True, False])
+    rank = df.groupby("category").cumcount()
+    df = df.assign(description=df["description"].where(rank < top_n, DIGER))
+    return df.groupby(["category", "description"], as_index=False, sort=False)["amount"].sum()
+
+# --- FİGÜRLER (stiller sayfalardaki önceki görünümle aynı) ---
+def pie(df):
+    if df.empty: return None
+    import plotly.express as px
+    fig = px.pie(df, values='amount', names='category', hole=0.6, template="plotly_dark", color_discrete_sequence=px.colors.sequential.Oranges)
+    fig.update_layout(showlegend=False, margin=dict(l=10,r=10,t=10,b=10), height=220, paper_bgcolor="rgba(0,0,0,0)")
+    fig.update_traces(textposition='inside', textinfo='percent')
+    return fig
+
+def bar(df):
+    if df.empty: return None
+    import plotly.express as px
+    fig = px.bar(df, x="date", y="amount", color="type", color_discrete_map=RENKLER, template="plotly_dark")
+    fig.update_layout(showlegend=True, margin=dict(l=0,r=0,t=0,b=0), height=250, paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+def line(df):
+    if df.empty: return None
+    import plotly.express as px
+    fig = px.line(df, x='date', y='amount', color='type', markers=True, color_discrete_map=RENKLER, template="plotly_dark")
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", height=350)
+    return fig
+
+def sunburst(df):
+    if df.empty: return None
+    import plotly.express as px
+    # FIX: Colors düzeltildi (Oranges)
+    fig = px.sunburst(df, path=['category', 'description'], values='amount', color_discrete_sequence=px.colors.sequential.Oranges)
+    fig.update_layout(margin=dict(t=0, b=0, l=0, r=0), height=350, paper_bgcolor="rgba(0,0,0,0)")
+    return fig
@@ -0,0 +1,119 @@
+# --- VERİTABANI KATMANI ---
+# Streamlit her rerun'da ana scripti yeniden çalıştırır ama import edilen modüller
+# süreç boyunca yaşar; bağlantı havuzu bu yüzden burada tutulur.
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
+
+import pandas as pd
+
+import perf
+
+DB_FILE = "onyx_v14.db"
+POOL_SIZE = 32  # bağlantılar ihtiyaç oldukça açılır; sınır eşzamanlı oturum/indirme sayısını karşılamalı
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE = 256
+
+
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self):
+        # isolation_level=None: tek ifadeler autocommit, çoklu ifadeler transaction() ile
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                               check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _acquire(self):
+        try: return self._idle.get_nowait()
+        except queue.Empty: pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        try: return self._idle.get(timeout=BUSY_TIMEOUT_MS / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"pool exhausted: {self.size} bağlantının hepsi {BUSY_TIMEOUT_MS} ms boyunca meşgul ({self.path})") from None
+
+    def _release(self, conn):
+        if conn.in_transaction: conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        # Aynı thread içinde iç içe kullanım aynı bağlantıyı paylaşır
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+        conn = self._acquire()
+        self._local.conn = conn
+        try: yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            if conn.in_transaction:
+                # Dıştaki transaction'a katıl, commit onun işi
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close_all(self):
+        with self._lock:
+            while True:
+                try: self._idle.get_nowait().close()
+                except queue.Empty: break
+            self._created = 0
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path=None):
+    path = path or DB_FILE
+    with _pools_lock:
+        if path not in _pools: _pools[path] = ConnectionPool(path)
+        return _pools[path]
+
+def connection(path=None):
+    return get_pool(path).connection()
+
+def transaction(path=None):
+    return get_pool(path).transaction()
+
+# Ölçüm açıksa her çağrı süre, ifade ve satır sayısıyla perf tamponuna yazılır
+def execute(query, params=(), fetch=False, path=None):
+    t0 = perf.now() if perf.ENABLED else None
+    with connection(path) as conn:
+        c = conn.execute(query, params)
+        res = c.fetchall() if fetch else True
+    if t0 is not None: perf.sql(query, t0, len(res) if fetch else c.rowcount)
+    return res
+
+def read_df(query, params=(), path=None):
+    t0 = perf.now() if perf.ENABLED else None
+    with connection(path) as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    if t0 is not None: perf.sql(query, t0, len(df))
+    return df
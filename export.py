@@ -0,0 +1,141 @@
+# --- DIŞA AKTARMA ---
+# İşlemler SQLite'tan CHUNK_ROWS'luk parçalar halinde okunup doğrudan CSV / Parquet / XLSX
+# yazıcısına aktarılır; bellekte hiçbir zaman tüm döküm bulunmaz. Kapsam: tek dönem,
+# tarih aralığı, kullanıcının tüm geçmişi ya da (admin) tüm kullanıcılar.
+# Parquet için pyarrow, XLSX için openpyxl gerekir; yoksa yalnızca CSV kullanılabilir.
+# Uygulamada Streamlit'in indirme düğmesi dosyanın tamamını belleğe alıp ondan sonra
+# gönderir (yanıtı akıtan bir yol yoktur); bu yüzden uygulama içi indirmeler APP_MAX_ROWS
+# ile sınırlıdır, daha büyük dökümler CLI ile alınır.
+#
+#   python export.py --user atakan --period 2025-11 -o kasim.csv
+#   python export.py --all --format parquet -o tum_islemler.parquet
+import os
+import sys
+import argparse
+import tempfile
+import importlib.util
+
+import pandas as pd
+
+import db
+
+CHUNK_ROWS = 10000
+XLSX_MAX_ROWS = 1_048_575  # başlık satırı hariç sayfa sınırı
+APP_MAX_ROWS = 500_000
+COLUMNS = ["id", "username", "date", "type", "category", "amount", "description"]
+FORMATS = {"csv": ("text/csv", ".csv"), "parquet": ("application/octet-stream", ".parquet"),
+           "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx")}
+
+def _scope(username=None, period=None, date_from=None, date_to=None):
+    where, params = [], []
+    if username: where.append("username = ?"); params.append(username)
+    if period: where.append("date >= ? AND date < date(?, '+1 month')"); params += [f"{period}-01", f"{period}-01"]
+    if date_from: where.append("date >= ?"); params.append(str(date_from))
+    if date_to: where.append("date < date(?, '+1 day')"); params.append(str(date_to))
+    sql = f"SELECT {', '.join(COLUMNS)} FROM transactions"
+    if where: sql += " WHERE " + " AND ".join(where)
+    # Kullanıcı kapsamında (username, date, id) indeksi sıralamayı karşılar
+    return sql + " ORDER BY username, date, id", params
+
+def count_rows(username=None, period=None, date_from=None, date_to=None):
+    # Özet tablodan tam sayım; ham tablo taranmaz
+    where, params = [], []
+    if username: where.append("username = ?"); params.append(username)
+    if period: where.append("period = ?"); params.append(period)
+    if date_from: where.append("day >= ?"); params.append(str(date_from))
+    if date_to: where.append("day <= ?"); params.append(str(date_to))
+    sql = "SELECT COALESCE(SUM(n), 0) FROM tx_rollup" + (" WHERE " + " AND ".join(where) if where else "")
+    return db.execute(sql, params, fetch=True)[0][0]
+
+def iter_chunks(chunk_rows=CHUNK_ROWS, **scope):
+    sql, params = _scope(**scope)
+    with db.connection() as conn:
+        for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunk_rows):
+            yield chunk
+
+def available_formats():
+    # Yalnızca kurulu mu diye bakılır; modüller ancak yazarken import edilir
+    return ["csv"] + [fmt for fmt, mod in (("parquet", "pyarrow"), ("xlsx", "openpyxl")) if importlib.util.find_spec(mod)]
+
+def write_csv(chunks, f):
+    # Boş sonuçta read_sql_query yine de (boş) bir parça verebilir; başlık bir kez yazılır
+    n, i = 0, -1
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(f, index=False, header=(i == 0))
+        n += len(chunk)
+    if i < 0: pd.DataFrame(columns=COLUMNS).to_csv(f, index=False)
+    return n
+
+def write_parquet(chunks, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([("id", pa.int64()), ("username", pa.string()), ("date", pa.date32()), ("type", pa.string()),
+                        ("category", pa.string()), ("amount", pa.float64()), ("description", pa.string())])
+    n = 0
+    with pq.ParquetWriter(f, schema) as w:
+        for chunk in chunks:
+            chunk = chunk.assign(date=pd.to_datetime(chunk["date"], format="ISO8601").dt.date)
+            w.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            n += len(chunk)
+    return n
+
+def write_xlsx(chunks, f):
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)  # satırlar akış halinde yazılır
+    ws, rows_in_sheet, n = None, XLSX_MAX_ROWS, 0
+    for chunk in chunks:
+        for rec in chunk.itertuples(index=False):
+            if rows_in_sheet >= XLSX_MAX_ROWS:
+                ws = wb.create_sheet(f"İşlemler {len(wb.worksheets) + 1}")
+                ws.append(COLUMNS)
+                rows_in_sheet = 0
+            ws.append(list(rec))
+            rows_in_sheet += 1
+            n += 1
+    if ws is None: wb.create_sheet("İşlemler 1").append(COLUMNS)
+    wb.save(f)
+    return n
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+def export(fmt, f, chunk_rows=CHUNK_ROWS, **scope):
+    # f: yol ya da dosya nesnesi (CSV için metin, diğerleri için ikili)
+    return WRITERS[fmt](iter_chunks(chunk_rows, **scope), f)
+
+def to_bytes(fmt, **scope):
+    # Streamlit indirme düğmesi için: dosya parça parça diske yazılır, bitince okunup silinir.
+    # Düğme veriyi zaten belleğe alacağı için bellekte bir kez bitmiş dosya bulunur.
+    fd, path = tempfile.mkstemp(suffix=FORMATS[fmt][1])
+    os.close(fd)
+    try:
+        if fmt == "csv":
+            with open(path, "w", encoding="utf-8-sig", newline="") as fh: export(fmt, fh, **scope)
+        else: export(fmt, path, **scope)
+        with open(path, "rb") as fh: return fh.read()
+    finally: os.unlink(path)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="İşlemleri CSV/Parquet/XLSX olarak dışa aktarır")
+    who = ap.add_mutually_exclusive_group(required=True)
+    who.add_argument("--user")
+    who.add_argument("--all", action="store_true", help="tüm kullanıcılar (admin)")
+    ap.add_argument("--period", help="YYYY-MM")
+    ap.add_argument("--from", dest="date_from")
+    ap.add_argument("--to", dest="date_to")
+    ap.add_argument("--format", choices=list(WRITERS), default="csv")
+    ap.add_argument("-o", "--output", required=True)
+    ap.add_argument("--db", default=db.DB_FILE)
+    args = ap.parse_args(argv)
+    db.DB_FILE = args.db
+    if args.format not in available_formats():
+        print(f"{args.format} için gerekli paket kurulu değil.", file=sys.stderr)
+        return 2
+    scope = dict(username=args.user, period=args.period, date_from=args.date_from, date_to=args.date_to)
+    if args.format == "csv":
+        with open(args.output, "w", encoding="utf-8-sig", newline="") as fh: n = export("csv", fh, **scope)
+    else: n = export(args.format, args.output, **scope)
+    print(f"{n:,} işlem yazıldı: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# --- KOMPAKT İŞLEM ÇERÇEVESİ ---
+# Kullanıcı başına bellekte tutulan çerçeve sabit sözlüklü kategorik kolonlarla kurulur:
+# type/category/period int8 kodlardır, tutar tam sayı kuruştur (kurus), username
+# her çerçevede sabit olduğu için hiç yüklenmez. Açıklamalar istenirse sonradan,
+# yalnızca gereken id'ler için okunur (load_descriptions). Formlar, defter filtreleri ve
+# editördeki seçim kutuları da aynı sabit sözlükleri kullanır.
+import pandas as pd
+
+import db
+
+GIDER_KATEGORILERI = ["Abonelik - İnternet/Dijital", "Gıda - Market", "Gıda - Restoran", "Konut - Kira", "Fatura", "Ulaşım", "Kişisel", "Sağlık", "Eğlence", "Eğitim", "Diğer"]
+GELIR_KATEGORILERI = ["Maaş", "Ek Gelir", "Yatırım", "Diğer"]
+TURLER = ["Gider", "Gelir"]
+KATEGORILER = list(dict.fromkeys(GIDER_KATEGORILERI + GELIR_KATEGORILERI))
+
+COLUMNS = ["id", "date", "period", "type", "category", "kurus", "description"]
+
+def categorical(values, vocab):
+    # Sözlük dışı (eski/elle girilmiş) değerler NaN olmasın diye sona eklenir
+    extra = sorted(set(values.dropna().unique()) - set(vocab))
+    return pd.Categorical(values, categories=list(vocab) + extra)
+
+def compact(raw):
+    # raw: transactions satırları (date metin, amount TL)
+    df = pd.DataFrame({"id": pd.to_numeric(raw["id"], downcast="integer")})
+    df["date"] = pd.to_datetime(raw["date"])
+    df["period"] = pd.Categorical(raw["date"].str[:7])
+    df["type"] = categorical(raw["type"], TURLER)
+    df["category"] = categorical(raw["category"], KATEGORILER)
+    df["kurus"] = pd.to_numeric((raw["amount"].fillna(0) * 100).round().astype("int64"), downcast="integer")
+    if "description" in raw: df["description"] = raw["description"]
+    return df
+
+def load_user_frame(username, with_description=True):
+    cols = "id, date, type, category, amount" + (", description" if with_description else "")
+    raw = db.read_df(f"SELECT {cols} FROM transactions WHERE username = ? ORDER BY id", (username,))
+    if raw.empty: return pd.DataFrame(columns=COLUMNS if with_description else COLUMNS[:-1])
+    return compact(raw)
+
+def load_descriptions(ids):
+    ids = [int(i) for i in ids]
+    if not ids: return pd.Series(dtype=object)
+    found = {}
+    for i in range(0, len(ids), 900):
+        part = ids[i:i + 900]
+        found.update(db.execute(f"SELECT id, description FROM transactions WHERE id IN ({','.join('?' * len(part))})", part, fetch=True))
+    return pd.Series(found, dtype=object).reindex(ids)
+
+def amount_tl(df):
+    return df["kurus"] / 100
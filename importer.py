@@ -0,0 +1,225 @@
+# --- BANKA EKSTRESİ İÇE AKTARMA ---
+# CSV ve OFX ekstreleri akış halinde okunur; satırlar CHUNK_SIZE'lık parçalar halinde
+# transactions'a yazılır (parça başına tek transaction). Bellek kullanımı dosya
+# boyutundan bağımsızdır. Kolonlar takma ad tablosuyla, kategoriler açıklamaya uygulanan
+# kural tablosuyla eşlenir. Aynı (tarih, tür, tutar, açıklama) içe aktarma başlamadan önce
+# zaten varsa satır atlanır; kontrol (username, date, amount, description) indeksi üzerinden
+# SQL'de yapılır. Dosyanın kendi içindeki tekrarlar (aynı gün iki kahve) korunur.
+#
+#   python importer.py ekstre.csv --user atakan
+#   python importer.py ekstre.ofx --user atakan --db onyx_v14.db
+import io
+import re
+import csv
+import sys
+import argparse
+from datetime import datetime
+
+import db
+import writer
+import migrations
+from frames import GIDER_KATEGORILERI, GELIR_KATEGORILERI
+
+CHUNK_SIZE = 5000
+
+ALIASES = {
+    "date": ["tarih", "işlem tarihi", "islem tarihi", "date", "transaction date", "booking date"],
+    "amount": ["tutar", "işlem tutarı", "islem tutari", "amount"],
+    "debit": ["borç", "borc", "çıkan", "cikan", "debit"],
+    "credit": ["alacak", "giren", "credit"],
+    "description": ["açıklama", "aciklama", "işlem açıklaması", "description", "memo", "details"],
+    "type": ["tür", "tur", "type"],
+    "category": ["kategori", "category"],
+}
+
+# (desen, kategori); açıklama ve desenler _fold'dan geçirilip sırayla denenir, ilk eşleşen kazanır
+GIDER_KURALLARI = [
+    (r"netflix|spotify|youtube|disney|amazon prime|apple\.com|icloud|exxen|blutv", "Abonelik - İnternet/Dijital"),
+    (r"migros|carrefour|\ba101\b|\bbim\b|şok market|macrocenter|market", "Gıda - Market"),
+    (r"restoran|restaurant|cafe|kafe|yemeksepeti|getir yemek|trendyol yemek|starbucks|burger", "Gıda - Restoran"),
+    (r"\bkira\b", "Konut - Kira"),
+    (r"elektrik|doğalgaz|dogalgaz|\bsu\b|iski|aski|turkcell|vodafone|türk telekom|fatura", "Fatura"),
+    (r"akaryakıt|akaryakit|opet|shell|petrol ofisi|\bbp\b|taksi|uber|bitaksi|istanbulkart|metro|otopark", "Ulaşım"),
+    (r"eczane|hastane|klinik|doktor", "Sağlık"),
+    (r"sinema|konser|biletix|steam|playstation", "Eğlence"),
+    (r"okul|kurs|udemy|coursera|kitap", "Eğitim"),
+]
+GELIR_KURALLARI = [
+    (r"maaş|maas|salary|ücret ödemesi", "Maaş"),
+    (r"faiz|temettü|temettu|fon satış|hisse", "Yatırım"),
+]
+
+_FOLD = str.maketrans("ıİIşŞğĞüÜöÖçÇ", "iiissgguuoocc")
+
+def _fold(s):
+    # Büyük/küçük harf ve Türkçe karakter farkı gözetmeden eşleşme: 'SPOTIFY', 'Maaş', 'MAAŞ' -> aynı
+    return (s or "").translate(_FOLD).lower()
+
+def parse_amount(s):
+    s = str(s).strip().replace("₺", "").replace("TL", "").replace(" ", "")
+    if not s: return None
+    if "," in s and "." in s:
+        # Son görülen ayraç ondalıktır: 1.234,56 ya da 1,234.56
+        s = s.replace(".", "").replace(",", ".") if s.rfind(",") > s.rfind(".") else s.replace(",", "")
+    elif "," in s: s = s.replace(",", ".")
+    return float(s)
+
+DATE_FORMATS = ["%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d", "%d.%m.%Y %H:%M", "%d.%m.%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S"]
+
+def parse_date(s, order=None):
+    # order: okuyucuya ait biçim listesi; bir ekstrede tüm satırlar aynı biçimde olduğu
+    # için son başarılı biçim başa alınır
+    s = str(s).strip()
+    order = order if order is not None else list(DATE_FORMATS)
+    for i, fmt in enumerate(order):
+        try: d = datetime.strptime(s, fmt)
+        except ValueError: continue
+        if i: order.insert(0, order.pop(i))
+        return d.strftime("%Y-%m-%d")
+    raise ValueError(f"Tarih anlaşılamadı: {s}")
+
+def map_columns(header, overrides=None):
+    # header -> {alan: kolon adı}; overrides ({alan: kolon}) önceliklidir
+    by_norm = {_fold(h.strip()): h for h in header}
+    mapping = {}
+    for field, names in ALIASES.items():
+        for a in names:
+            if _fold(a) in by_norm: mapping[field] = by_norm[_fold(a)]; break
+    mapping.update(overrides or {})
+    if "date" not in mapping or not ({"amount", "debit", "credit"} & mapping.keys()):
+        raise ValueError(f"Tarih/tutar kolonları bulunamadı: {list(header)}")
+    return mapping
+
+def compile_rules(rules):
+    return [(re.compile(_fold(p)), cat) for p, cat in rules]
+
+_COMPILED = {}
+
+def categorize(description, type_, rules=None):
+    gider, gelir = rules or (GIDER_KURALLARI, GELIR_KURALLARI)
+    table = gider if type_ == "Gider" else gelir
+    if id(table) not in _COMPILED: _COMPILED[id(table)] = compile_rules(table)
+    d = _fold(description)
+    for pattern, cat in _COMPILED[id(table)]:
+        if pattern.search(d): return cat
+    return "Diğer"
+
+def _row(date, amount, description, type_=None, category=None, rules=None):
+    # Tek tip satır: (date, type, category, amount, description); tutar her zaman pozitif
+    if type_ not in ("Gider", "Gelir"): type_ = "Gider" if amount < 0 else "Gelir"
+    vocab = GIDER_KATEGORILERI if type_ == "Gider" else GELIR_KATEGORILERI
+    if category not in vocab: category = categorize(description, type_, rules)
+    return (date, type_, category, abs(amount), (description or "").strip())
+
+def read_csv(f, mapping=None, rules=None, stats=None):
+    sample = f.read(4096); f.seek(0)
+    try: dialect = csv.Sniffer().sniff(sample, delimiters=";,\t|")
+    except csv.Error: dialect = csv.excel
+    reader = csv.DictReader(f, dialect=dialect)
+    m = map_columns(reader.fieldnames or [], mapping)
+    order = list(DATE_FORMATS)
+    for rec in reader:
+        try:
+            if "amount" in m: amount = parse_amount(rec[m["amount"]])
+            else: amount = (parse_amount(rec.get(m.get("credit"), "") or 0) or 0) - (parse_amount(rec.get(m.get("debit"), "") or 0) or 0)
+            if amount is None: raise ValueError("tutar boş")
+            t = rec.get(m["type"]) if "type" in m else None
+            yield _row(parse_date(rec[m["date"]], order), amount, rec.get(m.get("description")), t, rec.get(m.get("category")), rules)
+        except (ValueError, KeyError, TypeError):
+            if stats is not None: stats["invalid"] += 1
+
+def _ofx_tokens(f, block=65536):
+    # SGML (kapanışsız) ve XML OFX için: '<' ile bölünmüş (etiket, değer) akışı
+    tail = ""
+    while True:
+        data = f.read(block)
+        if not data: break
+        parts = (tail + data).split("<")
+        tail = parts.pop()
+        for p in parts:
+            if ">" in p:
+                tag, _, val = p.partition(">")
+                yield tag.strip().upper(), val.strip()
+    if ">" in tail:
+        tag, _, val = tail.partition(">")
+        yield tag.strip().upper(), val.strip()
+
+def read_ofx(f, rules=None, stats=None):
+    cur = None
+    for tag, val in _ofx_tokens(f):
+        if tag == "STMTTRN": cur = {}
+        elif tag == "/STMTTRN" and cur is not None:
+            try:
+                desc = " ".join(v for v in (cur.get("NAME"), cur.get("MEMO")) if v)
+                yield _row(parse_date(cur["DTPOSTED"][:8]), parse_amount(cur["TRNAMT"]), desc, rules=rules)
+            except (ValueError, KeyError, TypeError):
+                if stats is not None: stats["invalid"] += 1
+            cur = None
+        elif cur is not None and not tag.startswith("/"): cur[tag] = val
+
+def _chunks(it, n):
+    buf = []
+    for x in it:
+        buf.append(x)
+        if len(buf) >= n:
+            yield buf; buf = []
+    if buf: yield buf
+
+STAGE = "CREATE TEMP TABLE IF NOT EXISTS import_stage (username TEXT, date TEXT, type TEXT, category TEXT, amount REAL, description TEXT)"
+
+def import_rows(username, rows, chunk_size=CHUNK_SIZE, progress=None, stats=None):
+    # rows: _row() biçiminde satır akışı. progress(stats) her parçadan sonra çağrılır.
+    stats = stats if stats is not None else {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+    # Yalnızca içe aktarmadan önce var olan satırlarla karşılaştır
+    watermark = db.execute("SELECT COALESCE(MAX(id), 0) FROM transactions", fetch=True)[0][0]
+    def _insert(conn, chunk):
+        # Her parça yazıcı kuyruğunda tek niyettir; geçici tablo yazıcının bağlantısında yaşar
+        conn.execute(STAGE)
+        conn.executemany("INSERT INTO import_stage VALUES (?,?,?,?,?,?)", [(username, *r) for r in chunk])
+        n = conn.execute('''INSERT INTO transactions(username, date, type, category, amount, description)
+            SELECT username, date, type, category, amount, description FROM import_stage s
+            WHERE NOT EXISTS (SELECT 1 FROM transactions t WHERE t.username = s.username AND t.date = s.date
+                AND t.amount = s.amount AND t.description = s.description AND t.type = s.type AND t.id <= ?)''', (watermark,)).rowcount
+        conn.execute("DELETE FROM import_stage")
+        return n
+    for chunk in _chunks(rows, chunk_size):
+        n = writer.write(_insert, chunk)
+        stats["read"] += len(chunk)
+        stats["inserted"] += n
+        stats["duplicates"] += len(chunk) - n
+        if progress: progress(stats)
+    return stats
+
+def import_file(username, f, fmt="csv", mapping=None, rules=None, chunk_size=CHUNK_SIZE, progress=None, encoding="utf-8-sig"):
+    # f: yol ya da ikili/metin dosya nesnesi (Streamlit UploadedFile dahil)
+    if isinstance(f, str):
+        with open(f, "rb") as fh: return import_file(username, fh, fmt, mapping, rules, chunk_size, progress, encoding)
+    if not isinstance(f, io.TextIOBase): f = io.TextIOWrapper(f, encoding=encoding, errors="replace", newline="")
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+    rows = read_ofx(f, rules, stats) if fmt == "ofx" else read_csv(f, mapping, rules, stats)
+    return import_rows(username, rows, chunk_size, progress, stats)
+
+def detect_format(name):
+    return "ofx" if name.lower().endswith((".ofx", ".qfx")) else "csv"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Banka ekstresini (CSV/OFX) transactions tablosuna aktarır")
+    ap.add_argument("file")
+    ap.add_argument("--user", required=True)
+    ap.add_argument("--db", default=db.DB_FILE)
+    ap.add_argument("--format", choices=["csv", "ofx"])
+    ap.add_argument("--encoding", default="utf-8-sig")
+    ap.add_argument("--chunk", type=int, default=CHUNK_SIZE)
+    ap.add_argument("--map", action="append", default=[], metavar="ALAN=KOLON", help="kolon eşlemesi, ör. --map date=Valör")
+    args = ap.parse_args(argv)
+    db.DB_FILE = args.db
+    migrations.ensure(args.db)
+    mapping = dict(m.split("=", 1) for m in args.map)
+    def progress(s): print(f"\r{s['read']:,} satır okundu · {s['inserted']:,} eklendi · {s['duplicates']:,} mükerrer", end="", file=sys.stderr)
+    stats = import_file(args.user, args.file, args.format or detect_format(args.file), mapping, chunk_size=args.chunk, progress=progress, encoding=args.encoding)
+    print(file=sys.stderr)
+    print(f"Okunan: {stats['read']:,}  Eklenen: {stats['inserted']:,}  Mükerrer: {stats['duplicates']:,}  Hatalı: {stats['invalid']:,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
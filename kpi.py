@@ -0,0 +1,48 @@
+# --- DASHBOARD KPI MOTORU ---
+# Dashboard'un tüm rakamları (genel toplam, aylık/günlük gelir-gider), pasta ve günlük
+# trend verisi tek geçişte hesaplanır: her satıra bir dönem kovası (geçmiş / bu ay /
+# bugün) atanır ve (kova, tür, kategori) üzerinden tek bir groupby yapılır. Tekrarlanan
+# maske/filtre geçişleri yoktur; maliyet çıktı hücresi sayısıyla büyür.
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import db
+import queries
+
+GECMIS, AY, BUGUN = 0, 1, 2
+
+def aggregate(rows, now=None):
+    # rows: day ('YYYY-MM-DD', bu ay dışı için None), type, category, total, n
+    now = now or datetime.now()
+    mo_s, mo_e = (pd.Timestamp(d) for d in queries.month_bounds(now))
+    td_s, td_e = (pd.Timestamp(d) for d in queries.day_bounds(now))
+    day = pd.to_datetime(rows["day"])
+    bucket = np.select([(day >= td_s) & (day < td_e), (day >= mo_s) & (day < mo_e)], [BUGUN, AY], GECMIS)
+    g = rows.groupby([bucket, rows["type"].astype(str), rows["category"].astype(str)])["total"].sum()
+
+    b, t = g.index.get_level_values(0), g.index.get_level_values(1)
+    gelir, gider = (t == "Gelir"), (t == "Gider")
+    month = b >= AY
+    out = {
+        "total_inc": float(g[gelir].sum()), "total_exp": float(g[gider].sum()),
+        "mo_inc": float(g[gelir & month].sum()), "mo_exp": float(g[gider & month].sum()),
+        "today_inc": float(g[gelir & (b == BUGUN)].sum()), "today_exp": float(g[gider & (b == BUGUN)].sum()),
+        "n": int(rows["n"].sum()),
+    }
+    pie = g[gider & month].groupby(level=2).sum()
+    out["pie"] = pd.DataFrame({"category": pie.index, "amount": pie.values})
+    in_month = bucket >= AY
+    trend = rows[in_month].groupby([day[in_month], rows["type"][in_month].astype(str)])["total"].sum()
+    out["trend"] = pd.DataFrame({"date": trend.index.get_level_values(0), "type": trend.index.get_level_values(1), "amount": trend.values})
+    return out
+
+def dashboard(username, now=None):
+    # Özet tablodan tek sorgu: bu ayın satırları gün bazında, öncesi (tür, kategori) başına tek satır
+    now = now or datetime.now()
+    mo_s, mo_e = queries.month_bounds(now)
+    rows = db.read_df("""
+        SELECT CASE WHEN day >= ? AND day < ? THEN day END AS day, type, category, SUM(total) AS total, SUM(n) AS n
+        FROM tx_rollup WHERE username = ? GROUP BY 1, type, category""", (mo_s, mo_e, username))
+    return aggregate(rows, now)
@@ -0,0 +1,83 @@
+# --- KAYIT DEFTERİ SAYFALAMA ---
+# Defter, (date, id) üzerinde keyset sayfalama ile okunur: bir sonraki sayfa
+# "son görülen (date, id)'den küçük olanlar" sorgusudur, OFFSET yoktur; sayfa ne kadar
+# ileride olursa olsun maliyet sayfa boyutu kadardır. Filtreler SQL tarafında uygulanır.
+# Okumalar (username, date, id) indeksini kullanır (bkz. migrations.py).
+import pandas as pd
+
+import db
+import writer
+
+PAGE_SIZE = 50
+
+def _where(username, filters):
+    where, params = ["username = ?"], [username]
+    if filters.get("date_from"):
+        where.append("date >= ?"); params.append(str(filters["date_from"]))
+    if filters.get("date_to"):
+        # date_to dahil; saatli değerler de yakalansın diye ertesi güne kadar
+        where.append("date < date(?, '+1 day')"); params.append(str(filters["date_to"]))
+    if filters.get("type"):
+        where.append("type = ?"); params.append(filters["type"])
+    if filters.get("categories"):
+        where.append(f"category IN ({','.join('?' * len(filters['categories']))})"); params.extend(filters["categories"])
+    if filters.get("search"):
+        q = filters["search"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append("description LIKE ? ESCAPE '\\'"); params.append(f"%{q}%")
+    return where, params
+
+def fetch_page(username, filters=None, after=None, page_size=PAGE_SIZE):
+    # after: önceki sayfanın son satırının (date, id) anahtarı; sıralama yeniden eskiye
+    # Dönüş: (sayfa çerçevesi, sonraki sayfanın anahtarı ya da None)
+    where, params = _where(username, filters or {})
+    if after:
+        where.append("(date < ? OR (date = ? AND id < ?))"); params.extend([after[0], after[0], after[1]])
+    df = db.read_df(f"""
+        SELECT id, date, type, category, amount, description FROM transactions
+        WHERE {' AND '.join(where)} ORDER BY date DESC, id DESC LIMIT ?""", (*params, page_size + 1))
+    nxt = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        nxt = (df["date"].iloc[-1], int(df["id"].iloc[-1]))
+    df = df.assign(date=pd.to_datetime(df["date"]))
+    return df.reset_index(drop=True), nxt
+
+# --- DEĞİŞİKLİK SETİ ---
+# st.data_editor durumu (edited_rows / deleted_rows / added_rows) yazıcı kuyruğunda tek
+# niyet olarak uygulanır: bir satırın tüm alan düzenlemeleri tek UPDATE olur, aynı kolon kümesini
+# düzenleyen satırlar tek executemany ile gider; silmeler ve eklemeler de toplu yapılır.
+EDITABLE = ("date", "type", "category", "amount", "description")
+REQUIRED = {"date": "Tarih", "type": "Tür", "category": "Kategori"}
+NEW_ROW = {"type": "Gider", "category": "Diğer", "amount": 0.0, "description": ""}
+
+def _value(k, v):
+    if v is None: return None
+    if k == "date": return pd.to_datetime(v).strftime("%Y-%m-%d")
+    if k == "amount": return float(v)
+    return str(v)
+
+def apply_changes(username, ids, state, today=None):
+    # ids: editördeki sayfanın konum -> id eşlemesi (sayfa çerçevesinin id kolonu)
+    deleted = {int(i) for i in state.get("deleted_rows", [])}
+    updates = {}
+    for i, r in state.get("edited_rows", {}).items():
+        if int(i) in deleted: continue
+        cols = tuple(k for k in EDITABLE if k in r)
+        empty = [REQUIRED[k] for k in cols if k in REQUIRED and r[k] is None]
+        if empty: raise ValueError(f"{', '.join(empty)} boş bırakılamaz.")
+        if cols: updates.setdefault(cols, []).append(tuple(_value(k, r[k]) for k in cols) + (int(ids[int(i)]), username))
+    deletes = [(int(ids[i]), username) for i in sorted(deleted)]
+    today = (today or pd.Timestamp.now()).strftime("%Y-%m-%d")
+    inserts = []
+    for r in state.get("added_rows", []):
+        r = {k: v for k, v in r.items() if k in EDITABLE and v is not None}
+        if not r: continue
+        row = {**NEW_ROW, "date": today, **{k: _value(k, v) for k, v in r.items()}}
+        inserts.append((username, row["date"], row["type"], row["category"], row["amount"], row["description"]))
+    def _apply(conn):
+        for cols, rows in updates.items():
+            conn.executemany(f"UPDATE transactions SET {', '.join(f'{c} = ?' for c in cols)} WHERE id = ? AND username = ?", rows)
+        if deletes: conn.executemany("DELETE FROM transactions WHERE id = ? AND username = ?", deletes)
+        if inserts: conn.executemany("INSERT INTO transactions(username, date, type, category, amount, description) VALUES (?,?,?,?,?,?)", inserts)
+    writer.write(_apply)
+    return {"updated": sum(len(r) for r in updates.values()), "deleted": len(deletes), "inserted": len(inserts)}
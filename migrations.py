@@ -0,0 +1,76 @@
+# --- ŞEMA GÖÇLERİ ---
+# Şema sürümü veritabanında PRAGMA user_version olarak tutulur. Her göç bir kez, tek
+# transaction'da uygulanır ve sürüm aynı transaction'da ilerletilir. ensure() süreç
+# başına (veritabanı dosyası başına) bir kez veritabanına gider; sonraki rerun'lar
+# yalnızca bir küme kontrolü öder. Yeni şema değişikliği MIGRATIONS'ın sonuna eklenir,
+# var olanlar değiştirilmez.
+#
+# Sürüm öncesi (user_version = 0) veritabanlarında tablolar zaten olabilir; bu yüzden
+# ilk göçlerdeki ifadelerin hepsi IF NOT EXISTS'tir. İfadeler burada dondurulur, modüllerdeki
+# listelere başvurulmaz. İstisna özet tablosudur: trigger'lar ve doldurma rollups.py'de yaşar,
+# gövdeleri değişince yeni bir göç recreate_triggers'ı çağırır.
+import threading
+
+import db
+import rollups
+
+def _bump(row):
+    return f"INSERT INTO data_version VALUES (COALESCE({row}.username, ''), 1) ON CONFLICT (username) DO UPDATE SET version = version + 1;"
+
+MIGRATIONS = [
+    (1, "temel tablolar", [
+        '''CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password TEXT, join_date TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, date TEXT, type TEXT, category TEXT, amount REAL, description TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS cat_limits (username TEXT, category TEXT, limit_amount REAL, PRIMARY KEY (username, category))''',
+    ]),
+    (2, "işlem indeksleri", [
+        "CREATE INDEX IF NOT EXISTS idx_tx_user_date ON transactions (username, date, type, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_tx_user_cat_date ON transactions (username, category, date, amount)",  # abonelikler
+        "CREATE INDEX IF NOT EXISTS idx_tx_ledger ON transactions (username, date, id)",  # defter sayfaları, tarih aralıkları
+        "CREATE INDEX IF NOT EXISTS idx_tx_dedup ON transactions (username, date, amount, description)",  # içe aktarma mükerrer kontrolü
+    ]),
+    (3, "özet tablosu ve trigger'lar", [rollups.ensure]),
+    (4, "bütçe durumu", [
+        '''CREATE TABLE IF NOT EXISTS budget_status (username TEXT, period TEXT, category TEXT, limit_amount REAL, spent REAL, pct REAL, status TEXT, evaluated_at TEXT, PRIMARY KEY (username, period, category)) WITHOUT ROWID''',
+        "CREATE INDEX IF NOT EXISTS idx_budget_period_status ON budget_status (period, status, pct)",
+    ]),
+    # Toplamlar tx_rollup'tan geliyor; aralık okumaları idx_tx_ledger'ı seçiyor
+    (5, "kullanılmayan idx_tx_user_date", ["DROP INDEX IF EXISTS idx_tx_user_date"]),
+    (6, "boş anahtarlı işlemler için özet trigger'ları", [rollups.recreate_triggers]),
+    # Kullanıcı başına veri sürümü; süreç içi önbellekler bununla tazelik kontrol eder (bkz. cache.py)
+    (7, "veri sürümü", [
+        "CREATE TABLE IF NOT EXISTS data_version (username TEXT PRIMARY KEY, version INTEGER NOT NULL) WITHOUT ROWID",
+        *[f"CREATE TRIGGER IF NOT EXISTS trg_{t}_ver_ins AFTER INSERT ON {t} BEGIN {_bump('NEW')} END" for t in ("transactions", "cat_limits")],
+        *[f"CREATE TRIGGER IF NOT EXISTS trg_{t}_ver_del AFTER DELETE ON {t} BEGIN {_bump('OLD')} END" for t in ("transactions", "cat_limits")],
+        *[f"CREATE TRIGGER IF NOT EXISTS trg_{t}_ver_upd AFTER UPDATE ON {t} BEGIN {_bump('OLD')} {_bump('NEW')} END" for t in ("transactions", "cat_limits")],
+    ]),
+]
+LATEST = MIGRATIONS[-1][0]
+
+_done = set()
+_lock = threading.Lock()
+
+def version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(path=None):
+    # Dönüş: uygulanan göçlerin adları
+    applied = []
+    with db.transaction(path) as conn:
+        current = version(conn)
+        for v, name, steps in MIGRATIONS:
+            if v <= current: continue
+            for step in steps:
+                if callable(step): step(conn)
+                else: conn.execute(step)
+            applied.append(name)
+        if current < LATEST: conn.execute(f"PRAGMA user_version = {LATEST}")
+    return applied
+
+def ensure(path=None):
+    path = path or db.DB_FILE
+    if path in _done: return
+    with _lock:
+        if path in _done: return
+        migrate(path)
+        _done.add(path)
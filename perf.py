@@ -0,0 +1,67 @@
+# --- PERFORMANS ÖLÇÜMÜ ---
+# Rerun'ların zamanı nereye gidiyor (SQL, pandas, Plotly)? Menü dalları, db katmanındaki
+# her sorgu (ifade metni ve satır sayısıyla) ve figür kurulum/serileştirme süreleri
+# sınırlı bir halka tampona örnek olarak yazılır; admin panelindeki "⏱️ Performans"
+# sekmesi p50/p95 ve en yavaş sorguları buradan gösterir.
+# ENABLED kapalıyken çağıranlar yalnızca tek bir bayrak kontrolü öder.
+# OMNYX_PERF=0 ile süreç kapalı başlar; admin panelinden açılıp kapatılabilir.
+import os
+import time
+import threading
+from collections import deque
+
+import pandas as pd
+
+ENABLED = os.environ.get("OMNYX_PERF", "1") != "0"
+MAX_SAMPLES = 5000
+SQL_TEXT = 200
+
+SPAN, SQL, FIGURE = "span", "sql", "figure"
+
+now = time.perf_counter
+_samples = deque(maxlen=MAX_SAMPLES)  # (kind, name, ms, rows, zaman damgası, thread)
+
+def record(kind, name, t0, rows=None):
+    # t0: now() ile alınan başlangıç
+    _samples.append((kind, name, (now() - t0) * 1000, rows, time.time(), threading.get_ident()))
+
+def sql(query, t0, rows=None):
+    record(SQL, " ".join(query.split())[:SQL_TEXT], t0, rows)
+
+class Span:
+    # st.rerun() dalı istisnayla keser; stop() hiç çağrılmazsa örnek yazılmaz
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name, self.t0 = name, now()
+
+    def stop(self):
+        record(SPAN, self.name, self.t0)
+
+def start(name):
+    return Span(name) if ENABLED else None
+
+def stop(span):
+    if span is not None: span.stop()
+
+def frame():
+    df = pd.DataFrame(list(_samples), columns=["kind", "name", "ms", "rows", "ts", "thread"])
+    return df.astype({"ms": "float64", "rows": "float64", "ts": "float64"})
+
+def summary(kind=None):
+    df = frame()
+    if kind: df = df[df["kind"] == kind]
+    keys = ["name"] if kind else ["kind", "name"]
+    if df.empty: return pd.DataFrame(columns=keys + ["count", "p50_ms", "p95_ms", "max_ms", "total_ms", "rows"])
+    g = df.groupby(keys)
+    out = pd.DataFrame({"count": g.size(), "p50_ms": g["ms"].median(), "p95_ms": g["ms"].quantile(0.95),
+                        "max_ms": g["ms"].max(), "total_ms": g["ms"].sum(), "rows": g["rows"].mean()})
+    return out.round(2).sort_values("total_ms", ascending=False).reset_index()
+
+def slowest(kind=SQL, n=20):
+    df = frame()
+    df = df[df["kind"] == kind].nlargest(n, "ms")
+    return df.assign(ts=pd.to_datetime(df["ts"], unit="s").dt.strftime("%H:%M:%S"), ms=df["ms"].round(2))[["ts", "name", "ms", "rows"]].reset_index(drop=True)
+
+def clear():
+    _samples.clear()
@@ -0,0 +1,41 @@
+# --- SORGU MOTORU ---
+# Dashboard ve Limitler sayfalarının ihtiyaç duyduğu rakamlar, kullanıcının tüm
+# geçmişini pandas'a çekmek yerine indeksli aralık sorgularıyla hesaplanır.
+# Tarihler 'YYYY-MM-DD' metni olarak tutulduğu için aralıklar [başlangıç, bitiş) şeklindedir.
+# Toplamlar tx_rollup özetinden (bkz. rollups.py), satır gerektirenler ham tablodan okunur.
+from datetime import timedelta
+
+import pandas as pd
+
+import db
+
+ABONELIK_KATEGORISI = "Abonelik - İnternet/Dijital"
+
+# Kategoriye göre satır okumaları (abonelikler) (username, category, date) indeksini,
+# tarih aralığı okumaları (bugünün işlemleri, dönem dökümü) defterin (username, date, id)
+# indeksini kullanır; indeksler migrations.py'de tanımlıdır.
+
+def month_bounds(now):
+    start = now.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+def day_bounds(now):
+    return now.strftime("%Y-%m-%d"), (now + timedelta(days=1)).strftime("%Y-%m-%d")
+
+def has_transactions(username):
+    return bool(db.execute("SELECT EXISTS(SELECT 1 FROM tx_rollup WHERE username = ?)", (username,), fetch=True)[0][0])
+
+def transactions_between(username, start, end):
+    df = db.read_df("""
+        SELECT id, date, type, category, amount, description FROM transactions
+        WHERE username = ? AND date >= ? AND date < ? ORDER BY date, id""", (username, start, end))
+    if not df.empty: df["date"] = pd.to_datetime(df["date"])
+    return df
+
+def subscription_rows(username):
+    df = db.read_df("""
+        SELECT id, date, amount, description FROM transactions
+        WHERE username = ? AND category = ? ORDER BY id""", (username, ABONELIK_KATEGORISI))
+    if not df.empty: df["date"] = pd.to_datetime(df["date"])
+    return df
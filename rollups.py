@@ -0,0 +1,117 @@
+# --- ÖZET (ROLLUP) TABLOLARI ---
+# tx_rollup, transactions tablosunun (kullanıcı, dönem, gün, tür, kategori) bazında
+# toplam/adet özetidir. Trigger'lar ile bakılır: form kayıtları, defter düzenlemeleri,
+# silmeler ve admin_delete_user hepsi aynı transaction içinde özeti günceller.
+# Raporlar sayfası ham tabloyu değil bu özeti okur.
+#
+#   python rollups.py verify   -> özet ile ham tablo arasındaki farkları listeler
+#   python rollups.py rebuild  -> özeti ham tablodan sıfırdan üretir
+import sys
+import argparse
+
+import db
+
+# Anahtar kolonları WITHOUT ROWID birincil anahtarında NOT NULL'dur; tarihi, türü ya da
+# kategorisi boş işlemler '' anahtarına yazılır.
+def _key(r):
+    return f"COALESCE({r}.username, ''), COALESCE(substr({r}.date, 1, 7), ''), COALESCE(substr({r}.date, 1, 10), ''), COALESCE({r}.type, ''), COALESCE({r}.category, '')"
+
+def _match(r):
+    return (f"username = COALESCE({r}.username, '') AND period = COALESCE(substr({r}.date, 1, 7), '') AND day = COALESCE(substr({r}.date, 1, 10), '')"
+            f" AND type = COALESCE({r}.type, '') AND category = COALESCE({r}.category, '')")
+
+TRIGGERS = ["trg_tx_rollup_ins", "trg_tx_rollup_del", "trg_tx_rollup_upd"]
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS tx_rollup (username TEXT, period TEXT, day TEXT, type TEXT, category TEXT, total REAL NOT NULL DEFAULT 0, n INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (username, period, day, type, category)) WITHOUT ROWID''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_tx_rollup_ins AFTER INSERT ON transactions BEGIN
+        INSERT INTO tx_rollup VALUES ({_key("NEW")}, COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (username, period, day, type, category) DO UPDATE SET total = total + excluded.total, n = n + 1;
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_tx_rollup_del AFTER DELETE ON transactions BEGIN
+        UPDATE tx_rollup SET total = total - COALESCE(OLD.amount, 0), n = n - 1 WHERE {_match("OLD")};
+        DELETE FROM tx_rollup WHERE {_match("OLD")} AND n <= 0;
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_tx_rollup_upd AFTER UPDATE OF username, date, type, category, amount ON transactions BEGIN
+        UPDATE tx_rollup SET total = total - COALESCE(OLD.amount, 0), n = n - 1 WHERE {_match("OLD")};
+        DELETE FROM tx_rollup WHERE {_match("OLD")} AND n <= 0;
+        INSERT INTO tx_rollup VALUES ({_key("NEW")}, COALESCE(NEW.amount, 0), 1)
+        ON CONFLICT (username, period, day, type, category) DO UPDATE SET total = total + excluded.total, n = n + 1;
+    END''',
+]
+
+_RAW_GROUPED = '''SELECT COALESCE(username, '') AS username, COALESCE(substr(date, 1, 7), '') AS period, COALESCE(substr(date, 1, 10), '') AS day,
+        COALESCE(type, '') AS type, COALESCE(category, '') AS category, SUM(COALESCE(amount, 0)) AS total, COUNT(*) AS n
+    FROM transactions GROUP BY 1, 2, 3, 4, 5'''
+
+def ensure(conn):
+    # Tablo yeni oluşturulduysa mevcut veriyle bir kere doldurulur
+    fresh = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tx_rollup'").fetchone()
+    for q in SCHEMA: conn.execute(q)
+    if fresh: _fill(conn)
+
+def recreate_triggers(conn):
+    # Trigger gövdesi değişince: IF NOT EXISTS eskisini yerinde bırakacağı için önce düşürülür
+    for t in TRIGGERS: conn.execute(f"DROP TRIGGER IF EXISTS {t}")
+    for q in SCHEMA[1:]: conn.execute(q)
+
+def _fill(c):
+    c.execute("DELETE FROM tx_rollup")
+    c.execute(f"INSERT INTO tx_rollup {_RAW_GROUPED}")
+    return c.execute("SELECT COUNT(*) FROM tx_rollup").fetchone()[0]
+
+def rebuild():
+    # Çağıran zaten bir transaction içindeyse ona katılır. Özetten türetilen saklı sonuçlar
+    # (bütçe durumu) yenilensin diye tüm kullanıcıların veri sürümü artırılır.
+    with db.transaction() as c:
+        n = _fill(c)
+        c.execute("UPDATE data_version SET version = version + 1")
+        return n
+
+def verify(username=None):
+    # Ham tablo ile özet arasındaki sapmalar: (username, period, day, type, category, raw_total, raw_n, roll_total, roll_n)
+    where = "WHERE username = ?" if username else ""
+    params = (username, username) if username else ()
+    return db.execute(f'''
+        WITH raw AS (SELECT * FROM ({_RAW_GROUPED}) {where}),
+             roll AS (SELECT * FROM tx_rollup {where})
+        SELECT raw.username, raw.period, raw.day, raw.type, raw.category, raw.total, raw.n, roll.total, roll.n
+        FROM raw LEFT JOIN roll USING (username, period, day, type, category)
+        WHERE roll.n IS NULL OR roll.n != raw.n OR abs(roll.total - raw.total) > 0.005
+        UNION ALL
+        SELECT roll.username, roll.period, roll.day, roll.type, roll.category, NULL, NULL, roll.total, roll.n
+        FROM roll LEFT JOIN raw USING (username, period, day, type, category)
+        WHERE raw.n IS NULL''', params, fetch=True)
+
+# --- RAPOR SORGULARI ---
+def periods(username):
+    return [r[0] for r in db.execute("SELECT DISTINCT period FROM tx_rollup WHERE username = ? ORDER BY period DESC", (username,), fetch=True)]
+
+def period_totals(username, period):
+    rows = db.execute("SELECT type, SUM(total) FROM tx_rollup WHERE username = ? AND period = ? GROUP BY type", (username, period), fetch=True)
+    return {t: a for t, a in rows}
+
+def top_category(username, period, type_="Gider"):
+    row = db.execute('''SELECT category, SUM(total) AS s FROM tx_rollup WHERE username = ? AND period = ? AND type = ?
+        GROUP BY category ORDER BY s DESC, category LIMIT 1''', (username, period, type_), fetch=True)
+    return row[0][0] if row else None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="tx_rollup özet tablosu bakımı")
+    ap.add_argument("command", choices=["verify", "rebuild"])
+    ap.add_argument("--db", default=db.DB_FILE)
+    ap.add_argument("--user")
+    args = ap.parse_args(argv)
+    db.DB_FILE = args.db
+    import migrations  # migrations bu modülü import ettiği için burada
+    migrations.ensure(args.db)
+    if args.command == "rebuild":
+        print(f"{rebuild()} özet satırı üretildi.")
+        return 0
+    drift = verify(args.user)
+    for r in drift: print("SAPMA", *r)
+    print("Özet tutarlı." if not drift else f"{len(drift)} sapma bulundu.")
+    return 1 if drift else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
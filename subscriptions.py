@@ -0,0 +1,56 @@
+# --- ABONELİK TAKVİMİ ---
+# Abonelik ödemeleri son kayıttaki günden itibaren aylık tekrar eder. Bir sonraki ödeme
+# tarihi tüm satırlar için tek vektörel işlemle bulunur: bugüne kadar geçen ay sayısı
+# doğrudan hesaplanır, gün ayın son gününe kırpılır (31 Ocak -> 28/29 Şubat -> 31 Mart).
+# Aynı servis (açıklama) için birden çok ödeme kaydı varsa yalnızca en sonuncusu aktiftir.
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SERVIS = "Servis"
+
+def add_months(dates, k):
+    # dates: datetime Series, k: ay sayısı (skaler ya da aynı uzunlukta dizi)
+    total = dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1 + np.asarray(k)
+    y, m = total // 12, total % 12 + 1
+    first = pd.to_datetime(pd.DataFrame({"year": y, "month": m, "day": 1}))
+    d = np.minimum(dates.dt.day.to_numpy(), first.dt.days_in_month.to_numpy())
+    return first + pd.to_timedelta(d - 1, unit="D")
+
+def active(rows):
+    # rows: date, amount, description (+ id). Servis başına en son ödeme.
+    if rows.empty: return rows
+    key = rows["description"].fillna("").str.strip().str.casefold()
+    order = rows.assign(_k=key).sort_values(["date", "id"] if "id" in rows else ["date"])
+    return order.drop_duplicates("_k", keep="last").drop(columns="_k")
+
+def schedule(rows, today=None):
+    # Aktif abonelikler; next_date ve days_left eklenmiş, en yakın ödeme önce
+    today = pd.Timestamp(today or datetime.now().date()).normalize()
+    subs = active(rows)
+    if subs.empty: return subs.assign(next_date=pd.Series(dtype="datetime64[ns]"), days_left=pd.Series(dtype=int))
+    start = subs["date"].dt.normalize()
+    k = np.maximum((today.year - start.dt.year) * 12 + (today.month - start.dt.month), 0).to_numpy()
+    nxt = add_months(start, k)
+    # Kırpılmış gün bugünden önceyse bir ay sonrası
+    late = (nxt < today).to_numpy()
+    nxt = add_months(start, k + late)
+    subs = subs.assign(next_date=nxt.to_numpy(), description=subs["description"].fillna("").replace("", SERVIS))
+    subs["days_left"] = (subs["next_date"] - today).dt.days
+    return subs.sort_values(["next_date", "description"]).reset_index(drop=True)
+
+def upcoming(rows, months=3, today=None):
+    # Önümüzdeki `months` ay içindeki tüm ödemeler (nakit akışı görünümü için)
+    today = pd.Timestamp(today or datetime.now().date()).normalize()
+    subs = schedule(rows, today)
+    if subs.empty: return pd.DataFrame(columns=["date", "description", "amount"])
+    horizon = add_months(pd.Series([today]), months)[0]
+    start = subs["date"].dt.normalize()
+    base = ((subs["next_date"].dt.year - start.dt.year) * 12 + (subs["next_date"].dt.month - start.dt.month)).to_numpy()
+    steps = np.arange(months + 1)
+    rep = np.repeat(np.arange(len(subs)), len(steps))
+    k = np.repeat(base, len(steps)) + np.tile(steps, len(subs))
+    dates = add_months(start.iloc[rep].reset_index(drop=True), k)
+    out = pd.DataFrame({"date": dates, "description": subs["description"].to_numpy()[rep], "amount": subs["amount"].to_numpy()[rep]})
+    return out[(out["date"] >= today) & (out["date"] < horizon)].sort_values(["date", "description"]).reset_index(drop=True)
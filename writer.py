@@ -0,0 +1,153 @@
+# --- TEK YAZICI KUYRUĞU ---
+# Oturumlar veritabanına kendileri yazmaz: her yazma bir "niyet" (conn alan bir fonksiyon)
+# olarak kuyruğa bırakılır, tek bir yazıcı thread'i bunları toplu commit eder. Kuyrukta
+# biriken niyetler (en fazla MAX_BATCH) tek BEGIN IMMEDIATE ... COMMIT içinde çalışır;
+# bir commit sürerken gelenler bir sonraki partiye girer. LINGER_MS > 0 ise ilk niyetten
+# sonra bu kadar daha beklenir (gecikme karşılığında daha büyük parti). Her niyet kendi
+# SAVEPOINT'indedir, hata veren yalnızca kendini geri alır. Çağıran, commit'ten sonra
+# sonucu (ya da hatayı) Future üzerinden alır. Okumalar db havuzundaki WAL okuyucularında kalır.
+#
+# Niyet fonksiyonu yalnızca kendisine verilen bağlantıyı kullanmalıdır; db.transaction()
+# gibi havuz bağlantısı açan çağrılar yazıcı kilidini beklerken takılır.
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import db
+import perf
+
+MAX_BATCH = 256
+LINGER_MS = 0
+TIMEOUT_S = 30
+
+_STOP = object()
+
+
+class Writer:
+    def __init__(self, path, max_batch=MAX_BATCH, linger_ms=LINGER_MS):
+        self.path = path
+        self.max_batch = max_batch
+        self.linger = linger_ms / 1000
+        self._q = queue.Queue()
+        self._pool = db.ConnectionPool(path, size=1)  # yazıcıya ayrılmış tek bağlantı
+        self._conn = None
+        self.batches = self.intents = 0
+        self._thread = threading.Thread(target=self._run, name="omnyx-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args):
+        # fn(conn, *args); dönen Future commit'ten sonra tamamlanır
+        if threading.current_thread() is self._thread:
+            # Niyet içinden gelen yazma: aynı transaction'da doğrudan çalışır
+            f = Future()
+            f.set_result(fn(self._conn, *args))
+            return f
+        f = Future()
+        self._q.put((fn, args, f))
+        return f
+
+    def write(self, fn, *args, timeout=TIMEOUT_S):
+        f = self.submit(fn, *args)
+        try: return f.result(timeout)
+        except TimeoutError:
+            # Hata ancak niyet kuyruktan geri alınabildiyse; çalışmaya başladıysa sonucu beklenir
+            if f.cancel(): raise
+            return f.result()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.max_batch:
+            try: item = self._q.get_nowait()
+            except queue.Empty:
+                left = deadline - time.monotonic()
+                if left <= 0: break
+                try: item = self._q.get(timeout=left)
+                except queue.Empty: break
+            if item is _STOP:
+                self._q.put(_STOP)  # bu parti bittikten sonra dur
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._q.get()
+            if first is _STOP: return
+            batch = self._collect(first)
+            done, ran = [], 0
+            try:
+                with self._pool.transaction() as conn:
+                    self._conn = conn
+                    for fn, args, f in batch:
+                        if not f.set_running_or_notify_cancel(): continue
+                        ran += 1
+                        conn.execute("SAVEPOINT niyet")
+                        try: res = fn(conn, *args)
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO niyet")
+                            conn.execute("RELEASE niyet")
+                            f.set_exception(e)
+                            continue
+                        conn.execute("RELEASE niyet")
+                        done.append((f, res))
+            except Exception as e:
+                # Commit (ya da BEGIN) başarısız: partideki hiçbir niyet yazılmadı
+                for f, _ in done: f.set_exception(e)
+                for fn, args, f in batch:
+                    if not f.done(): f.set_exception(e)
+                continue
+            finally:
+                self._conn = None
+            for f, res in done: f.set_result(res)
+            # İptal edilenler sayılmaz; parti ortalaması gerçekten çalışan niyetlerden
+            if ran:
+                self.batches += 1
+                self.intents += ran
+
+    def close(self):
+        self._q.put(_STOP)
+        self._thread.join()
+        self._pool.close_all()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+def get_writer(path=None):
+    path = path or db.DB_FILE
+    with _writers_lock:
+        if path not in _writers: _writers[path] = Writer(path)
+        return _writers[path]
+
+def submit(fn, *args, path=None):
+    return get_writer(path).submit(fn, *args)
+
+def write(fn, *args, path=None, timeout=TIMEOUT_S):
+    return get_writer(path).write(fn, *args, timeout=timeout)
+
+# Ölçüm açıksa süre kuyrukta bekleme dahil, commit onayına kadar ölçülür
+def execute(query, params=(), path=None):
+    t0 = perf.now() if perf.ENABLED else None
+    n = write(lambda conn: conn.execute(query, params).rowcount, path=path)
+    if t0 is not None: perf.sql(query, t0, n)
+    return n
+
+def executemany(query, seq, path=None):
+    seq = list(seq)
+    t0 = perf.now() if perf.ENABLED else None
+    n = write(lambda conn: conn.executemany(query, seq).rowcount, path=path)
+    if t0 is not None: perf.sql(query, t0, n)
+    return n
+
+def stats():
+    with _writers_lock:
+        return {p: {"batches": w.batches, "intents": w.intents, "queued": w._q.qsize()} for p, w in _writers.items()}
+
+@atexit.register
+def close_all():
+    with _writers_lock:
+        for w in _writers.values(): w.close()
+        _writers.clear()